@@ -8,7 +8,7 @@ from threading import Event, Thread
 from pynput.keyboard import Listener, Key
 from tkinter import filedialog, messagebox
 
-from update_checker import check_update
+from update_checker import check_update_background
 from logging_setup import setup_logging
 from config_manager import ConfigManager
 from language_manager import LanguageManager, KeyboardLayoutManager
@@ -31,6 +31,7 @@ class MusicApp:
     def __init__(self):
         setup_logging(VERSION)
         self._check_running()
+        self._update_future = check_update_background(VERSION, "VanilleIce/ProjectLyrica")
 
         self.config = ConfigManager.get_config()
 
@@ -162,24 +163,34 @@ class MusicApp:
         theme = self.config.get("ui_settings", {}).get("theme", "dark")
         ctk.set_appearance_mode(theme)
         
-        self.update_status, self.latest_version, self.update_url = self._check_updates()
+        self._set_update_status("current", "", "")
         self._create_gui_components()
         self._setup_gui_layout()
+        self._poll_update_check()
 
-    def _check_updates(self):
-        return check_update(VERSION, "VanilleIce/ProjectLyrica")
+    def _poll_update_check(self):
+        """Show the update check result once the background lookup has finished"""
+        if not self._update_future.done():
+            self.root.after(200, self._poll_update_check)
+            return
+        
+        self._set_update_status(*self._update_future.result())
+        self.version_link.configure(text=self.version_text, text_color=self.version_color)
 
-    def _create_gui_components(self):
-        if self.update_status == "update":
-            self.version_text = LanguageManager.get('update_available_text').format(self.latest_version)
+    def _set_update_status(self, status, latest_version, url):
+        self.update_status, self.latest_version, self.update_url = status, latest_version, url
+        
+        if status == "update":
+            self.version_text = LanguageManager.get('update_available_text').format(latest_version)
             self.version_color = "#FFA500"
-        elif self.update_status == "no_connection":
+        elif status == "no_connection":
             self.version_text = LanguageManager.get('no_connection_text')
             self.version_color = "#FF0000"
         else:
             self.version_text = LanguageManager.get('current_version_text').format(VERSION)
             self.version_color = "#1E90FF"
-        
+
+    def _create_gui_components(self):
         self.file_btn = self._create_button(
             LanguageManager.get("file_select_title"), 
             self._select_file, 300, 40, True
@@ -450,12 +461,11 @@ class MusicApp:
     def _on_theme_changed(self, new_theme):
         from settings_window import SettingsWindow
         if SettingsWindow.is_open():
-            for window in SettingsWindow._open_windows[:]:
-                try:
-                    window._on_close()
-                except:
-                    pass
-            SettingsWindow._open_windows.clear()
+            try:
+                SettingsWindow._current._on_close()
+            except:
+                pass
+            SettingsWindow._current = None
 
         text_color = "#FFFFFF" if new_theme == "dark" else "#000000"
         hover_color = "#2B2B2B" if new_theme == "dark" else "#E0E0E0"
@@ -1,9 +1,9 @@
 # Copyright (C) 2025 VanilleIce
 # This program is licensed under the GNU AGPLv3. See LICENSE for details.
 
-import json, logging, traceback
+import copy, json, logging, os, traceback
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 import xml.etree.ElementTree as ET
 
 logger = logging.getLogger("ProjectLyrica.ConfigManager")
@@ -332,10 +332,18 @@ class ConfigManager:
         return config
 
     @classmethod
-    def save(cls, updates: Dict[str, Any]) -> bool:
-        """Update and save configuration values while preserving existing ones."""
+    def save(cls, updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Update and save configuration values while preserving existing ones.
+
+        Returns the merged configuration on success, None on failure.
+        """
         try:
-            config = cls.get_config().copy()
+            # Merge into a deep copy so a failed write leaves the cached config untouched
+            config = copy.deepcopy(cls.get_config())
+
+            if cls._is_unchanged(config, updates):
+                logger.debug("Config save skipped, values unchanged")
+                return config
 
             for key, value in updates.items():
                 if isinstance(value, dict) and key in config and isinstance(config[key], dict):
@@ -343,25 +351,43 @@ class ConfigManager:
                 else:
                     config[key] = value
 
-            return cls._save_config(config)
+            return config if cls._save_config(config) else None
             
         except Exception as e:
             logger.error(f"Failed to update config: {e}")
-            return False
+            return None
+
+    @staticmethod
+    def _is_unchanged(config: Dict[str, Any], updates: Dict[str, Any]) -> bool:
+        """Check whether applying updates would leave config as it is"""
+        for key, value in updates.items():
+            current = config.get(key)
+            if isinstance(value, dict) and isinstance(current, dict):
+                if any(k not in current or current[k] != v for k, v in value.items()):
+                    return False
+            elif key not in config or current != value:
+                return False
+        return True
 
     @classmethod
     def _save_config(cls, config: Dict[str, Any]) -> bool:
         """Internal method to save config to file"""
+        tmp_file = cls.SETTINGS_FILE.with_suffix('.json.tmp')
         try:
             cls.SETTINGS_FILE.parent.mkdir(parents=True, exist_ok=True)
             
-            with open(cls.SETTINGS_FILE, 'w', encoding='utf-8') as f:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
                 json.dump(config, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_file, cls.SETTINGS_FILE)
                 
             cls._config = config
             return True
         except Exception as e:
             logger.error(f"Save failed: {e}")
+            try:
+                tmp_file.unlink()
+            except OSError:
+                pass
             return False
 
     @classmethod
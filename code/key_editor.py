@@ -5,10 +5,12 @@ import customtkinter as ctk
 from tkinter import messagebox
 import logging
 import xml.etree.ElementTree as ET
+from xml.dom import minidom
 from pathlib import Path
 from typing import Dict
 
-from language_manager import LanguageManager
+from config_manager import ConfigManager
+from language_manager import LanguageManager, KeyboardLayoutManager
 from resource_loader import resource_path
 
 logger = logging.getLogger("ProjectLyrica.KeyEditor")
@@ -56,11 +58,9 @@ class KeyEditorWindow:
 
     def _load_default_mapping(self) -> Dict[str, str]:
         """Load the default key mapping based on the current layout setting"""
-        from config_manager import ConfigManager
         config = ConfigManager.get_config()
         layout = config.get("ui_settings", {}).get("keyboard_layout", "QWERTY")
         
-        from language_manager import KeyboardLayoutManager
         return KeyboardLayoutManager.load_layout_silently(layout)
 
     def _load_current_mapping(self) -> Dict[str, str]:
@@ -390,7 +390,6 @@ class KeyEditorWindow:
             if custom_file.exists():
                 custom_file.unlink()
             
-            from config_manager import ConfigManager
             config = ConfigManager.get_config()
             lang_code = config.get("ui_settings", {}).get("selected_language", "en_US")
             
@@ -436,7 +435,6 @@ class KeyEditorWindow:
         
         root = ET.Element('layout')
         
-        from config_manager import ConfigManager
         config = ConfigManager.get_config()
         current_layout = config.get("ui_settings", {}).get("keyboard_layout", "QWERTY")
         
@@ -450,7 +448,6 @@ class KeyEditorWindow:
             key_elem.text = self.current_mapping[key_id]
         
         # Pretty XML
-        from xml.dom import minidom
         rough_string = ET.tostring(root, 'utf-8')
         parsed = minidom.parseString(rough_string)
         pretty_string = parsed.toprettyxml(indent="  ")
@@ -492,7 +489,6 @@ class KeyEditorWindow:
                 root = tree.getroot()
                 base_layout = root.get('base_layout', 'QWERTY')
             
-            from language_manager import KeyboardLayoutManager
             base_default_mapping = KeyboardLayoutManager.load_layout_silently(base_layout)
             
             has_actual_changes = any(
@@ -3,6 +3,7 @@
 
 import logging
 import xml.etree.ElementTree as ET
+from functools import lru_cache
 from pathlib import Path
 from config_manager import ConfigManager
 from tkinter import messagebox
@@ -17,6 +18,8 @@ class LanguageManager:
     _translations = {}
     _current_lang = None
     _languages = []
+    _name_by_code = None
+    _code_by_name = None
     _default_lang = 'en_US'
     _default_layout = 'QWERTY'
 
@@ -29,6 +32,8 @@ class LanguageManager:
         cls._current_lang = ui_settings.get("selected_language")
             
         cls._languages = cls._load_languages()
+        cls._name_by_code = cls._code_by_name = None
+        cls.get.cache_clear()
         
         if cls._current_lang:
             cls._get_translations(cls._current_lang)
@@ -45,13 +50,15 @@ class LanguageManager:
             logger.error(f"Language config file not found: {lang_file}")
             return [(cls._default_lang, "English", cls._default_layout)]
             
-        tree = ET.parse(lang_file)
         languages = []
         
-        for lang in tree.findall('language'):
+        for _, lang in ET.iterparse(lang_file):
+            if lang.tag != 'language':
+                continue
             code = lang.get('code')
             name = lang.text.strip() if lang.text else None
             layout = lang.get('key_layout', cls._default_layout)
+            lang.clear()
             
             if code and name:
                 languages.append((code, name, layout))
@@ -73,16 +80,19 @@ class LanguageManager:
         
         lang_file = Path(resource_path(f'resources/lang/{lang_code}.xml'))
         if not lang_file.exists():
-            if lang_code != cls._default_lang:
-                return cls._get_translations(cls._default_lang)
-            return {}
+            logger.warning(f"Language file not found: {lang_file}")
+            translations = cls._get_translations(cls._default_lang) if lang_code != cls._default_lang else {}
+            cls._translations[lang_code] = translations
+            return translations
             
-        tree = ET.parse(lang_file)
         translations = {}
         
-        for t in tree.findall('translation'):
+        for _, t in ET.iterparse(lang_file):
+            if t.tag != 'translation':
+                continue
             key = t.get('key')
             text = t.text.strip() if t.text else ""
+            t.clear()
             if key:
                 translations[key] = text
                     
@@ -90,6 +100,7 @@ class LanguageManager:
         return translations
 
     @classmethod
+    @lru_cache(maxsize=256)
     def get(cls, key):
         """Get translation for the given key."""
         if not key:
@@ -142,6 +153,7 @@ class LanguageManager:
             return False
 
         cls._current_lang = lang_code
+        cls.get.cache_clear()
         logger.info(f"Successfully set language to {lang_code}")
         return True
 
@@ -150,6 +162,27 @@ class LanguageManager:
         """Get list of available languages."""
         return cls._languages if cls._languages else [(cls._default_lang, "English", cls._default_layout)]
 
+    @classmethod
+    def _build_name_maps(cls):
+        """Build lookup tables between language codes and display names."""
+        languages = cls.get_languages()
+        cls._name_by_code = {code: name for code, name, _ in languages}
+        cls._code_by_name = {name: code for code, name, _ in languages}
+
+    @classmethod
+    def get_name_for(cls, code):
+        """Get display name for a language code, or the code itself if unknown."""
+        if cls._name_by_code is None:
+            cls._build_name_maps()
+        return cls._name_by_code.get(code, code)
+
+    @classmethod
+    def get_code_for(cls, name, default=None):
+        """Get language code for a display name."""
+        if cls._code_by_name is None:
+            cls._build_name_maps()
+        return cls._code_by_name.get(name, default)
+
 
 class KeyboardLayoutManager:
     """Handles loading and managing keyboard layouts."""
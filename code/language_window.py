@@ -31,25 +31,24 @@ class LanguageWindow:
             cls._open = False
             return
 
-        lang_dict = {name: code for code, name, _ in languages}
-        default_name = next(
-            (n for c, n, _ in languages if c == LanguageManager._current_lang),
-            languages[0][1]
-        )
+        current_lang = LanguageManager._current_lang
+        default_name = LanguageManager.get_name_for(current_lang)
+        if default_name == current_lang:
+            default_name = languages[0][1]
         
         ctk.CTkLabel(root, 
                      text=LanguageManager.get('select_language'), 
                      font=("Arial", 14)).pack(pady=10)
         
         combo = ctk.CTkComboBox(root, 
-                              values=list(lang_dict.keys()), 
+                              values=[name for _, name, _ in languages], 
                               state="readonly")
         combo.set(default_name)
         combo.pack(pady=10)
         
         def save():
             selected_name = combo.get()
-            if code := lang_dict.get(selected_name):
+            if code := LanguageManager.get_code_for(selected_name):
                 LanguageManager.set_language(code)
                 messagebox.showinfo("Info", LanguageManager.get('language_saved'))
             root.destroy()
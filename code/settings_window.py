@@ -2,31 +2,129 @@
 # This program is licensed under the GNU AGPLv3. See LICENSE for details.
 
 import customtkinter as ctk
-from tkinter import messagebox
-import logging
-from pathlib import Path
-import xml.etree.ElementTree as ET
+from tkinter import messagebox, filedialog
+import logging, os, re, subprocess, sys
+from collections import defaultdict
+from itertools import islice
+from dataclasses import dataclass, asdict
 
 from config_manager import ConfigManager
 from language_manager import LanguageManager
+from key_editor import KeyEditorWindow
 from resource_loader import resource_path
 
 logger = logging.getLogger("ProjectLyrica.SettingsWindow")
 
+_NUM_RE = re.compile(r'^\s*[+-]?(\d+(\.\d*)?|\.\d+)\s*$')
+_INT_RE = re.compile(r'^\s*[+-]?\d+\s*$')
+_GEOMETRY_RE = re.compile(r'^(\d+)x(\d+)\+?(-?\d+)\+?(-?\d+)$')
+
+_CUSTOM_LAYOUT_FILE = "resources/layouts/CUSTOM.xml"
+
+_DEFAULT_KEY_DURATIONS = (0.2, 0.248, 0.3, 0.5, 1.0)
+_DEFAULT_SPEED_PRESETS = (600, 800, 1000, 1200)
+_DEFAULT_PRESET_MAPPINGS = (("9", 600), ("0", 800), ("ß", 1000), ("´", 1200))
+
+_DEFAULT_ARRAY_STRS = {
+    "key_durations": ", ".join(map(str, _DEFAULT_KEY_DURATIONS)),
+    "speed_presets": ", ".join(map(str, _DEFAULT_SPEED_PRESETS)),
+}
+
+_LANG_TO_LAYOUT = {
+    "ar": "Arabic", "da": "QWERTY", "de": "QWERTZ", "en": "QWERTY",
+    "en_US": "QWERTY", "es": "QWERTY", "fr": "AZERTY", "id": "QWERTY",
+    "it": "QWERTY", "ja": "JIS", "ko_KR": "QWERTY", "mg_MG": "QWERTY",
+    "nl": "QWERTY", "pl": "QWERTY", "pt": "QWERTY", "ru": "йцукен",
+    "zh": "QWERTY",
+}
+
+def _default_preset_mappings():
+    """Fresh copy of the default speed preset mappings"""
+    return [{"key": key, "speed": speed} for key, speed in _DEFAULT_PRESET_MAPPINGS]
+
+_STEAM_SKY_PATHS = (
+    "C:/Program Files (x86)/Steam/steamapps/common/Sky Children of the Light",
+    "C:/Program Files/Steam/steamapps/common/Sky Children of the Light",
+)
+_STEAM_DIR_CACHE = None
+
+def _find_steam_sky_dir():
+    """Locate the Sky install directory, reusing the last successful probe"""
+    global _STEAM_DIR_CACHE
+    if _STEAM_DIR_CACHE:
+        return _STEAM_DIR_CACHE
+    
+    for path in _STEAM_SKY_PATHS:
+        if os.path.exists(path):
+            _STEAM_DIR_CACHE = path
+            return path
+    
+    path = os.path.expanduser("~/Steam/steamapps/common/Sky Children of the Light")
+    if os.path.exists(path):
+        _STEAM_DIR_CACHE = path
+        return path
+    return None
+
+_MISSING = object()
+
+def _dig(d, *path, default=None):
+    """Walk nested dicts along path, returning default on the first missing key"""
+    for key in path:
+        if not isinstance(d, dict):
+            return default
+        d = d.get(key, _MISSING)
+        if d is _MISSING:
+            return default
+    return d
+
+_TIMING_FIELDS = {"initial_delay", "pause_resume_delay", "begin_steps", "end_steps", "after_pause_steps"}
+_PLAYBACK_FIELDS = {"key_durations", "speed_presets"}
+_FIELD_CONFIG_KEYS = {
+    "pause_key": ("ui_settings", "pause_key"),
+    "theme": ("ui_settings", "theme"),
+    "sky_exe_path": ("game_settings", "sky_exe_path"),
+    "preset_mappings": ("speed_change_settings", "preset_mappings"),
+}
+_RESTART_FIELDS = {"language", "keyboard_layout"}
+
+@dataclass
+class SettingsSnapshot:
+    """Values edited in the settings window"""
+    initial_delay: float
+    pause_resume_delay: float
+    begin_steps: int
+    end_steps: int
+    after_pause_steps: int
+    language: str
+    theme: str
+    keyboard_layout: str
+    pause_key: str
+    sky_exe_path: str
+    key_durations: list
+    speed_presets: list
+    preset_mappings: list
+
+    def diff(self, other):
+        """Return the fields of other that differ from this snapshot"""
+        old = asdict(self)
+        return {key: value for key, value in asdict(other).items() if old[key] != value}
+
 class SettingsWindow:
-    _open_windows = []
+    _current = None
+    _icon_path = None
+    _layouts_cache = (None, None)
     
     def __init__(self, parent=None, theme_callback=None, timing_callback=None, playback_callback=None, pause_key_callback=None, speed_change_callback=None):
-        for window in SettingsWindow._open_windows[:]:
+        current = SettingsWindow._current
+        if current is not None:
             try:
-                if window.window.winfo_exists():
-                    window.window.focus()
-                    window.window.lift()
+                if current.window.winfo_exists():
+                    current.window.focus()
+                    current.window.lift()
                     return
-                else:
-                    SettingsWindow._open_windows.remove(window)
             except:
-                SettingsWindow._open_windows.remove(window)
+                pass
+            SettingsWindow._current = None
 
         self.parent = parent
         self.window = ctk.CTkToplevel(parent)
@@ -36,18 +134,22 @@ class SettingsWindow:
 
         self.window.withdraw()
 
+        if SettingsWindow._icon_path is None:
+            SettingsWindow._icon_path = resource_path("resources/icons/icon.ico")
+        
         try:
-            self.window.iconbitmap(resource_path("resources/icons/icon.ico"))
+            self.window.iconbitmap(SettingsWindow._icon_path)
         except:
             pass
         
-        SettingsWindow._open_windows.append(self)
+        SettingsWindow._current = self
         self.window.protocol("WM_DELETE_WINDOW", self._on_close)
         
         self.window.transient(parent)
         self.window.grab_set()
         
         self._check_missing_custom_layout()
+        self._custom_exists = self._custom_layout_exists()
         self._load_current_config()
         self._create_ui()
         self._setup_bindings()
@@ -57,11 +159,13 @@ class SettingsWindow:
         self.playback_callback = playback_callback
         self.pause_key_callback = pause_key_callback
         self.speed_change_callback = speed_change_callback
+        self._pending_callbacks = {}
         
         self._position_window()
 
         self.window.deiconify()
         self.window.focus()
+        self.window.after_idle(self._build_next_section)
 
     def _check_missing_custom_layout(self):
         """Checks whether custom layout has been deleted"""
@@ -76,11 +180,11 @@ class SettingsWindow:
         """Position window next to main window"""
         if self.parent and self.parent.winfo_exists():
             try:
-                self.parent.update_idletasks()
+                if not self.parent.winfo_viewable():
+                    self.parent.update_idletasks()
                 
-                main_x = self.parent.winfo_x()
-                main_y = self.parent.winfo_y()
-                main_width = self.parent.winfo_width()
+                match = _GEOMETRY_RE.match(self.parent.wm_geometry())
+                main_width, _, main_x, main_y = map(int, match.groups())
                 
                 settings_x = main_x + main_width + 10
                 settings_y = main_y
@@ -98,51 +202,25 @@ class SettingsWindow:
 
     def _load_current_config(self):
         """Load current configuration"""
-        self.config = ConfigManager.get_config()
-        
-        timing = self.config.get("timing_settings", {})
-        delays = timing.get("delays", {})
-        ramping = timing.get("ramping", {})
-        
-        self.current_delays = {
-            "initial_delay": delays.get("initial_delay", 0.8),
-            "pause_resume_delay": delays.get("pause_resume_delay", 1.0)
-        }
-        
-        self.current_ramping = {
-            "begin_steps": ramping.get("begin", {}).get("steps", 20),
-            "end_steps": ramping.get("end", {}).get("steps", 16), 
-            "after_pause_steps": ramping.get("after_pause", {}).get("steps", 12)
-        }
-        
-        ui_settings = self.config.get("ui_settings", {})
-        self.current_ui = {
-            "language": ui_settings.get("selected_language", "en_US"),
-            "theme": ui_settings.get("theme", "dark"),
-            "keyboard_layout": ui_settings.get("keyboard_layout", "QWERTY"),
-            "pause_key": ui_settings.get("pause_key", "#")
-        }
-
-        game_settings = self.config.get("game_settings", {})
-        self.current_game = {
-            "sky_exe_path": game_settings.get("sky_exe_path", "")
-        }
-
-        playback_settings = self.config.get("playback_settings", {})
-        self.current_playback = {
-            "key_durations": playback_settings.get("key_press_durations", [0.2, 0.248, 0.3, 0.5, 1.0]),
-            "speed_presets": playback_settings.get("speed_presets", [600, 800, 1000, 1200])
-        }
-        
-        speed_change_settings = self.config.get("speed_change_settings", {})
-        self.current_speed_change = {
-            "preset_mappings": speed_change_settings.get("preset_mappings", [
-                {"key": "1", "speed": 600},
-                {"key": "2", "speed": 800},
-                {"key": "3", "speed": 1000},
-                {"key": "4", "speed": 1200}
-            ])
-        }
+        cfg = self.config = ConfigManager.get_config()
+        
+        self.current = SettingsSnapshot(
+            initial_delay=_dig(cfg, "timing_settings", "delays", "initial_delay", default=0.8),
+            pause_resume_delay=_dig(cfg, "timing_settings", "delays", "pause_resume_delay", default=1.0),
+            begin_steps=_dig(cfg, "timing_settings", "ramping", "begin", "steps", default=20),
+            end_steps=_dig(cfg, "timing_settings", "ramping", "end", "steps", default=16),
+            after_pause_steps=_dig(cfg, "timing_settings", "ramping", "after_pause", "steps", default=12),
+            language=_dig(cfg, "ui_settings", "selected_language", default="en_US"),
+            theme=_dig(cfg, "ui_settings", "theme", default="dark"),
+            keyboard_layout=_dig(cfg, "ui_settings", "keyboard_layout", default="QWERTY"),
+            pause_key=_dig(cfg, "ui_settings", "pause_key", default="#"),
+            sky_exe_path=_dig(cfg, "game_settings", "sky_exe_path", default=""),
+            key_durations=_dig(cfg, "playback_settings", "key_press_durations", default=list(_DEFAULT_KEY_DURATIONS)),
+            speed_presets=_dig(cfg, "playback_settings", "speed_presets", default=list(_DEFAULT_SPEED_PRESETS)),
+            preset_mappings=_dig(cfg, "speed_change_settings", "preset_mappings", default=_default_preset_mappings())
+        )
+        # Input text captured before a reload is no baseline for the new values
+        self._orig_snapshot = None
 
     def _create_ui(self):
         """Create the user interface with scrollbar"""
@@ -164,14 +242,53 @@ class SettingsWindow:
         title_label.pack(pady=(0, 20))
         
         self._create_game_section(self.scrollable_frame)
-        self._create_playback_section(self.scrollable_frame)
-        self._create_speed_change_section(self.scrollable_frame)
-        self._create_delays_section(self.scrollable_frame)
-        self._create_ramping_section(self.scrollable_frame)
-        self._create_interface_section(self.scrollable_frame)
+        
+        self._pending_sections = []
+        for builder in (
+            self._create_playback_section,
+            self._create_speed_change_section,
+            self._create_delays_section,
+            self._create_ramping_section,
+            self._create_interface_section
+        ):
+            placeholder = ctk.CTkFrame(self.scrollable_frame, fg_color="transparent", height=1)
+            placeholder.pack(fill="x")
+            self._pending_sections.append((builder, placeholder))
         
         self._create_buttons_section(main_frame)
 
+    def _build_next_section(self):
+        """Build one deferred section per idle cycle after the window is shown"""
+        if not self._pending_sections or not self.window.winfo_exists():
+            return
+        
+        builder, placeholder = self._pending_sections.pop(0)
+        builder(placeholder)
+        
+        if self._pending_sections:
+            self.window.after_idle(self._build_next_section)
+        else:
+            self._orig_snapshot = self._raw_values()
+
+    def _build_all_sections(self):
+        """Build any sections that are still deferred"""
+        # No baseline is taken here: the inputs may already hold edits, so the
+        # next save runs the full snapshot diff instead
+        while self._pending_sections:
+            builder, placeholder = self._pending_sections.pop(0)
+            builder(placeholder)
+
+    def _raw_values(self):
+        """Raw text of every input, used to spot a save with nothing edited"""
+        return (
+            self.initial_delay_var.get(), self.pause_resume_delay_var.get(),
+            self.begin_steps_var.get(), self.end_steps_var.get(), self.after_pause_steps_var.get(),
+            self.key_durations_var.get(), self.speed_presets_var.get(),
+            self.pause_key_var.get(), self.theme_var.get(), self.sky_path_var.get(),
+            self.language_var.get(), self.keyboard_layout_var.get(),
+            *[(k.get(), v.get()) for k, v in zip(self.preset_key_vars, self.preset_speed_vars)]
+        )
+
     def _create_game_section(self, parent):
         section_frame = ctk.CTkFrame(parent)
         section_frame.pack(fill="x", pady=(0, 15))
@@ -188,7 +305,7 @@ class SettingsWindow:
         
         ctk.CTkLabel(path_frame, text=LanguageManager.get('settings_sky_path'), width=150).pack(side="left")
         
-        self.sky_path_var = ctk.StringVar(value=self.current_game.get('sky_exe_path', ''))
+        self.sky_path_var = ctk.StringVar(value=self.current.sky_exe_path or '')
         path_entry = ctk.CTkEntry(path_frame, textvariable=self.sky_path_var, width=250)
         path_entry.pack(side="left", padx=5, fill="x", expand=True)
         
@@ -208,12 +325,12 @@ class SettingsWindow:
         
         self._create_array_setting(
             section_frame, 'settings_key_durations', 'key_durations',
-            [0.2, 0.248, 0.3, 0.5, 1.0], 'settings_key_durations_hint'
+            list(_DEFAULT_KEY_DURATIONS), 'settings_key_durations_hint'
         )
         
         self._create_array_setting(
             section_frame, 'settings_speed_presets', 'speed_presets',
-            [600, 800, 1000, 1200], 'settings_speed_presets_hint'
+            list(_DEFAULT_SPEED_PRESETS), 'settings_speed_presets_hint'
         )
         
         custom_frame = ctk.CTkFrame(section_frame, fg_color="transparent")
@@ -267,21 +384,20 @@ class SettingsWindow:
         grid_frame = ctk.CTkFrame(self.preset_keys_frame, fg_color="transparent")
         grid_frame.pack(side="left", padx=5, fill="x", expand=True)
         
-        available_speeds = self.current_playback.get('speed_presets', [600, 800, 1000, 1200])
+        available_speeds = self.current.speed_presets
         speed_display_values = [f"{speed}" for speed in available_speeds]
         
-        current_mappings = self.current_speed_change.get('preset_mappings', [
-                {"key": "9", "speed": 600},
-                {"key": "0", "speed": 800},
-                {"key": "ß", "speed": 1000},
-                {"key": "´", "speed": 1200}
-        ])
+        current_mappings = self.current.preset_mappings or _default_preset_mappings()
         
         self.preset_key_vars = []
         self.preset_speed_vars = []
         
+        Frame, Label, Entry, ComboBox, StringVar = ctk.CTkFrame, ctk.CTkLabel, ctk.CTkEntry, ctk.CTkComboBox, ctk.StringVar
+        add_key_var = self.preset_key_vars.append
+        add_speed_var = self.preset_speed_vars.append
+        
         for row in range(2):
-            row_frame = ctk.CTkFrame(grid_frame, fg_color="transparent")
+            row_frame = Frame(grid_frame, fg_color="transparent")
             row_frame.pack(fill="x", pady=2)
             
             for col in range(2):
@@ -289,21 +405,21 @@ class SettingsWindow:
                 if preset_index >= len(current_mappings):
                     break
                     
-                preset_frame = ctk.CTkFrame(row_frame, fg_color="transparent")
+                preset_frame = Frame(row_frame, fg_color="transparent")
                 preset_frame.pack(side="left", padx=15)
                 
-                ctk.CTkLabel(preset_frame, text=f"Preset {preset_index + 1}:").pack(side="left")
+                Label(preset_frame, text=f"Preset {preset_index + 1}:").pack(side="left")
                 
-                key_var = ctk.StringVar(value=current_mappings[preset_index].get('key', f'{preset_index + 1}'))
-                key_entry = ctk.CTkEntry(preset_frame, textvariable=key_var, width=60)
+                key_var = StringVar(value=current_mappings[preset_index].get('key', f'{preset_index + 1}'))
+                key_entry = Entry(preset_frame, textvariable=key_var, width=60)
                 key_entry.pack(side="left", padx=2)
                 
-                ctk.CTkLabel(preset_frame, text="→").pack(side="left", padx=5)
+                Label(preset_frame, text="→").pack(side="left", padx=5)
                 
                 current_speed = current_mappings[preset_index].get('speed', available_speeds[preset_index] if preset_index < len(available_speeds) else 600)
-                speed_var = ctk.StringVar(value=f"{current_speed}")
+                speed_var = StringVar(value=f"{current_speed}")
                 
-                speed_dropdown = ctk.CTkComboBox(
+                speed_dropdown = ComboBox(
                     preset_frame, 
                     values=speed_display_values,
                     variable=speed_var,
@@ -312,8 +428,8 @@ class SettingsWindow:
                 )
                 speed_dropdown.pack(side="left", padx=2)
                 
-                self.preset_key_vars.append(key_var)
-                self.preset_speed_vars.append(speed_var)
+                add_key_var(key_var)
+                add_speed_var(speed_var)
 
     def _create_array_setting(self, parent, label_key, config_key, default_values, hint_key):
         frame = ctk.CTkFrame(parent, fg_color="transparent")
@@ -321,37 +437,26 @@ class SettingsWindow:
         
         ctk.CTkLabel(frame, text=LanguageManager.get(label_key), width=150).pack(side="left")
         
-        current_value = self.current_playback.get(config_key, default_values)
-        array_str = ", ".join(map(str, current_value))
+        default_str = _DEFAULT_ARRAY_STRS.get(config_key) or ", ".join(map(str, default_values))
+        current_value = getattr(self.current, config_key, default_values)
+        array_str = default_str if current_value == default_values else ", ".join(map(str, current_value))
         
         var = ctk.StringVar(value=array_str)
-        entry = ctk.CTkEntry(frame, textvariable=var, width=200, placeholder_text=", ".join(map(str, default_values)))
+        entry = ctk.CTkEntry(frame, textvariable=var, width=200, placeholder_text=default_str)
         entry.pack(side="left", padx=5)
         
         setattr(self, f"{config_key}_var", var)
+        setattr(self, f"_{config_key}_str", array_str)
         
         ctk.CTkLabel(frame, text=LanguageManager.get(hint_key), font=("Arial", 10), text_color="gray60").pack(side="left", padx=10)
 
     def _browse_sky_exe(self):
-        from tkinter import filedialog
-        import os
-        
-        steam_paths = [
-            "C:/Program Files (x86)/Steam/steamapps/common/Sky Children of the Light",
-            "C:/Program Files/Steam/steamapps/common/Sky Children of the Light",
-            os.path.expanduser("~/Steam/steamapps/common/Sky Children of the Light")
-        ]
-        
-        initial_dir = None
-        for path in steam_paths:
-            if os.path.exists(path):
-                initial_dir = path
-                break
-        
-        if not initial_dir and self.sky_path_var.get():
-            current_path = self.sky_path_var.get()
-            if os.path.exists(os.path.dirname(current_path)):
-                initial_dir = os.path.dirname(current_path)
+        initial_dir = _find_steam_sky_dir()
+        
+        if not initial_dir:
+            current_dir = os.path.dirname(self.sky_path_var.get().strip())
+            if current_dir and os.path.exists(current_dir):
+                initial_dir = current_dir
         
         file = filedialog.askopenfilename(
             title=LanguageManager.get('select_sky_exe'),
@@ -362,14 +467,16 @@ class SettingsWindow:
             self.sky_path_var.set(file)
 
     def _open_key_editor(self):
-        from key_editor import KeyEditorWindow
         KeyEditorWindow(self.window, self._update_ui_after_custom_save)
 
     def _update_ui_after_custom_save(self):
+        self._build_all_sections()
         self._load_current_config()
         
-        custom_file = Path("resources/layouts/CUSTOM.xml")
-        custom_exists = custom_file.exists()
+        custom_exists = self._custom_layout_exists()
+        if custom_exists != self._custom_exists:
+            SettingsWindow._layouts_cache = (None, None)
+        self._custom_exists = custom_exists
         
         self.custom_keys_status.configure(text=self._get_custom_keys_status())
         
@@ -387,43 +494,52 @@ class SettingsWindow:
         self.keyboard_layout_var.set(current_value)
 
     def _get_available_layouts(self):
+        try:
+            mtime = os.stat("resources/layouts").st_mtime_ns
+        except OSError:
+            mtime = None
+        
+        cached_mtime, cached_layouts = SettingsWindow._layouts_cache
+        if cached_layouts is not None and mtime is not None and cached_mtime == mtime:
+            return list(cached_layouts)
+        
         available_layouts = []
-        layouts_dir = Path("resources/layouts")
+        has_custom = False
         
-        if layouts_dir.exists():
-            for xml_file in layouts_dir.glob("*.xml"):
-                layout_name = xml_file.stem
-                if layout_name.upper() == "CUSTOM":
-                    continue
-                formatted_name = layout_name[0].upper() + layout_name[1:].lower()
-                available_layouts.append(formatted_name)
+        try:
+            with os.scandir("resources/layouts") as entries:
+                for entry in entries:
+                    name = entry.name
+                    if name[-4:].lower() != ".xml" or not entry.is_file():
+                        continue
+                    layout_name = name[:-4]
+                    if layout_name.upper() == "CUSTOM":
+                        has_custom = True
+                        continue
+                    available_layouts.append(layout_name[0].upper() + layout_name[1:].lower())
+        except FileNotFoundError:
+            pass
         
         available_layouts.sort()
         
-        custom_file = Path("resources/layouts/CUSTOM.xml")
-        if custom_file.exists() and "Custom" not in available_layouts:
+        if has_custom and "Custom" not in available_layouts:
             available_layouts.append("Custom")
         
+        SettingsWindow._layouts_cache = (mtime, tuple(available_layouts))
         return available_layouts
 
     def _get_fallback_layout(self):
         lang_code = self.config.get("ui_settings", {}).get("selected_language", "en_US")
-        lang_to_layout = {
-            "ar": "Arabic", "da": "QWERTY", "de": "QWERTZ", "en": "QWERTY",
-            "en_US": "QWERTY", "es": "QWERTY", "fr": "AZERTY", "id": "QWERTY",
-            "it": "QWERTY", "ja": "JIS", "ko_KR": "QWERTY", "mg_MG": "QWERTY",
-            "nl": "QWERTY", "pl": "QWERTY", "pt": "QWERTY", "ru": "йцукен",
-            "zh": "QWERTY",
-        }
-        return lang_to_layout.get(lang_code, "QWERTY")
+        return _LANG_TO_LAYOUT.get(lang_code, "QWERTY")
+
+    def _custom_layout_exists(self):
+        return os.path.exists(_CUSTOM_LAYOUT_FILE)
 
     def _get_custom_keys_status(self):
-        custom_file = Path("resources/layouts/CUSTOM.xml")
-        
-        if not custom_file.exists():
+        if not self._custom_exists:
             return LanguageManager.get('settings_using_default_layout')
         
-        current_layout = self.current_ui.get('keyboard_layout', '')
+        current_layout = self.current.keyboard_layout
         if current_layout == "Custom":
             return LanguageManager.get('settings_custom_active')
         else:
@@ -445,7 +561,7 @@ class SettingsWindow:
         
         ctk.CTkLabel(frame, text=LanguageManager.get(label_key), width=150).pack(side="left")
         
-        current_value = self.current_delays[config_key]
+        current_value = getattr(self.current, config_key)
         var = ctk.StringVar(value=f"{current_value}")
         
         entry = ctk.CTkEntry(frame, textvariable=var, width=80)
@@ -475,7 +591,7 @@ class SettingsWindow:
         
         ctk.CTkLabel(frame, text=LanguageManager.get(label_key), width=150).pack(side="left")
         
-        current_value = self.current_ramping[config_key]
+        current_value = getattr(self.current, config_key)
         var = ctk.StringVar(value=str(current_value))
         
         entry = ctk.CTkEntry(frame, textvariable=var, width=80, placeholder_text="20")
@@ -499,12 +615,12 @@ class SettingsWindow:
         
         self._create_dropdown(section_frame, 'settings_language', 'language', 
                              [name for _, name, _ in LanguageManager.get_languages()], 
-                             self.current_ui['language'])
+                             self.current.language)
         
         self._create_theme_selector(section_frame)
         
         available_layouts = self._get_available_layouts()
-        current_layout = self.current_ui['keyboard_layout']
+        current_layout = self.current.keyboard_layout
         if current_layout not in available_layouts:
             current_layout = available_layouts[0] if available_layouts else "QWERTY"
         
@@ -515,7 +631,7 @@ class SettingsWindow:
         pause_frame.pack(fill="x", padx=10, pady=5)
         
         ctk.CTkLabel(pause_frame, text=LanguageManager.get('settings_pause_key'), width=150).pack(side="left")
-        self.pause_key_var = ctk.StringVar(value=self.current_ui['pause_key'])
+        self.pause_key_var = ctk.StringVar(value=self.current.pause_key)
         ctk.CTkEntry(pause_frame, textvariable=self.pause_key_var, width=50).pack(side="left")
 
     def _create_dropdown(self, parent, label_key, config_key, values, current_value):
@@ -526,10 +642,7 @@ class SettingsWindow:
         
         display_value = current_value
         if config_key == 'language':
-            for code, name, _ in LanguageManager.get_languages():
-                if code == current_value:
-                    display_value = name
-                    break
+            display_value = LanguageManager.get_name_for(current_value)
         
         var = ctk.StringVar(value=display_value)
         dropdown = ctk.CTkComboBox(frame, values=values, variable=var, state="readonly", width=150)
@@ -548,7 +661,7 @@ class SettingsWindow:
         
         ctk.CTkLabel(frame, text=LanguageManager.get('settings_theme'), width=150).pack(side="left")
         
-        self.theme_var = ctk.StringVar(value=self.current_ui['theme'])
+        self.theme_var = ctk.StringVar(value=self.current.theme)
         
         theme_frame = ctk.CTkFrame(frame, fg_color="transparent")
         theme_frame.pack(side="left")
@@ -573,16 +686,28 @@ class SettingsWindow:
         self.window.bind('<Escape>', lambda e: self._on_close())
 
     def _validate_inputs(self):
-        try:            
-            initial_delay = float(self.initial_delay_var.get().strip())
-            pause_resume_delay = float(self.pause_resume_delay_var.get().strip())
+        try:
+            fields = (
+                ('settings_initial_delay', self.initial_delay_var.get(), _NUM_RE),
+                ('settings_pause_delay', self.pause_resume_delay_var.get(), _NUM_RE),
+                ('settings_ramping_start', self.begin_steps_var.get(), _INT_RE),
+                ('settings_ramping_end', self.end_steps_var.get(), _INT_RE),
+                ('settings_ramping_after_pause', self.after_pause_steps_var.get(), _INT_RE),
+            )
+            
+            for label_key, value, pattern in fields:
+                if not pattern.match(value):
+                    return False, f"{LanguageManager.get('settings_error_numbers')}: {LanguageManager.get(label_key)}"
+            
+            initial_delay = float(fields[0][1])
+            pause_resume_delay = float(fields[1][1])
             
             if initial_delay <= 0 or pause_resume_delay <= 0:
                 return False, LanguageManager.get('settings_error_positive')
             
-            begin_steps = int(self.begin_steps_var.get().strip())
-            end_steps = int(self.end_steps_var.get().strip())
-            after_pause_steps = int(self.after_pause_steps_var.get().strip())
+            begin_steps = int(fields[2][1])
+            end_steps = int(fields[3][1])
+            after_pause_steps = int(fields[4][1])
             
             if begin_steps <= 0 or end_steps <= 0 or after_pause_steps <= 0:
                 return False, LanguageManager.get('settings_error_positive')
@@ -593,148 +718,132 @@ class SettingsWindow:
                 
             return True, None
             
-        except ValueError:
-            return False, LanguageManager.get('settings_error_numbers')
         except Exception as e:
             logger.error(f"Validation error: {e}")
             return False, LanguageManager.get('settings_error_general')
 
+    def _read_snapshot(self):
+        """Build a snapshot from the values currently entered in the window"""
+        new_preset_mappings = []
+        available_speeds = self.current.speed_presets
+        available_set = set(available_speeds)
+        
+        preset_vars = islice(zip(self.preset_key_vars, self.preset_speed_vars), 4)
+        for i, (key_var, speed_var) in enumerate(preset_vars):
+            key = key_var.get().strip()
+            speed_str = speed_var.get().strip()
+            
+            try:
+                speed = int(speed_str)
+                if available_set and speed not in available_set:
+                    speed = available_speeds[0]
+            except (ValueError, TypeError):
+                speed = available_speeds[i] if i < len(available_speeds) else 600
+                
+            new_preset_mappings.append({
+                "key": key,
+                "speed": speed
+            })
+
+        key_durations_str = self.key_durations_var.get()
+        speed_presets_str = self.speed_presets_var.get()
+        if key_durations_str == self._key_durations_str and speed_presets_str == self._speed_presets_str:
+            key_durations = self.current.key_durations
+            speed_presets = self.current.speed_presets
+        else:
+            key_durations = self._parse_array_setting(key_durations_str, float)
+            speed_presets = self._parse_array_setting(speed_presets_str, int)
+
+        return SettingsSnapshot(
+            initial_delay=float(self.initial_delay_var.get()),
+            pause_resume_delay=float(self.pause_resume_delay_var.get()),
+            begin_steps=int(self.begin_steps_var.get()),
+            end_steps=int(self.end_steps_var.get()),
+            after_pause_steps=int(self.after_pause_steps_var.get()),
+            language=self._get_selected_lang_code(),
+            theme=self.theme_var.get(),
+            keyboard_layout=self.keyboard_layout_var.get(),
+            pause_key=self.pause_key_var.get(),
+            sky_exe_path=self.sky_path_var.get(),
+            key_durations=key_durations,
+            speed_presets=speed_presets,
+            preset_mappings=new_preset_mappings
+        )
+
     def _save_settings(self):
+        self._build_all_sections()
+        
+        raw_values = self._raw_values()
+        if raw_values == self._orig_snapshot:
+            messagebox.showinfo(LanguageManager.get('info_title'), LanguageManager.get('settings_no_changes'))
+            return
+        
         valid, error_msg = self._validate_inputs()
         if not valid:
             messagebox.showerror(LanguageManager.get('error_title'), error_msg)
             return
         
         try:
-            original_lang = self.current_ui['language']
-            original_layout = self.current_ui['keyboard_layout']
-            original_theme = self.current_ui['theme']
-            original_pause_key = self.current_ui['pause_key']
-            
-            updates = {}
+            new = self._read_snapshot()
+            changed = self.current.diff(new)
             
-            new_initial_delay = float(self.initial_delay_var.get())
-            new_pause_delay = float(self.pause_resume_delay_var.get())
-            new_begin_steps = int(self.begin_steps_var.get())
-            new_end_steps = int(self.end_steps_var.get())
-            new_after_pause_steps = int(self.after_pause_steps_var.get())
-            
-            timing_changed = (
-                new_initial_delay != self.current_delays["initial_delay"] or
-                new_pause_delay != self.current_delays["pause_resume_delay"] or
-                new_begin_steps != self.current_ramping["begin_steps"] or
-                new_end_steps != self.current_ramping["end_steps"] or
-                new_after_pause_steps != self.current_ramping["after_pause_steps"]
-            )
+            updates = defaultdict(dict)
             
-            if timing_changed:
+            if changed.keys() & _TIMING_FIELDS:
                 updates["timing_settings"] = {
                     "delays": {
-                        "initial_delay": new_initial_delay,
-                        "pause_resume_delay": new_pause_delay
+                        "initial_delay": new.initial_delay,
+                        "pause_resume_delay": new.pause_resume_delay
                     },
                     "ramping": {
-                        "begin": {"steps": new_begin_steps},
-                        "end": {"steps": new_end_steps},
-                        "after_pause": {"steps": new_after_pause_steps}
+                        "begin": {"steps": new.begin_steps},
+                        "end": {"steps": new.end_steps},
+                        "after_pause": {"steps": new.after_pause_steps}
                     }
                 }
             
-            new_pause_key = self.pause_key_var.get()
-            new_theme = self.theme_var.get()
-            
-            if new_pause_key != original_pause_key:
-                if "ui_settings" not in updates:
-                    updates["ui_settings"] = {}
-                updates["ui_settings"]["pause_key"] = new_pause_key
-            
-            if new_theme != original_theme:
-                if "ui_settings" not in updates:
-                    updates["ui_settings"] = {}
-                updates["ui_settings"]["theme"] = new_theme
-            
-            new_sky_path = self.sky_path_var.get()
-            if new_sky_path != self.current_game['sky_exe_path']:
-                updates["game_settings"] = {
-                    "sky_exe_path": new_sky_path
-                }
-
-            new_key_durations = self._parse_array_setting(self.key_durations_var.get(), float)
-            new_speed_presets = self._parse_array_setting(self.speed_presets_var.get(), int)
-            
-            playback_changed = (
-                new_key_durations != self.current_playback['key_durations'] or
-                new_speed_presets != self.current_playback['speed_presets']
-            )
+            for field in changed.keys() & _FIELD_CONFIG_KEYS.keys():
+                section, key = _FIELD_CONFIG_KEYS[field]
+                updates[section][key] = changed[field]
             
-            if playback_changed:
+            if changed.keys() & _PLAYBACK_FIELDS:
                 updates["playback_settings"] = {
-                    "key_press_durations": new_key_durations,
-                    "speed_presets": new_speed_presets
+                    "key_press_durations": new.key_durations,
+                    "speed_presets": new.speed_presets
                 }
 
-            new_preset_mappings = []
-            available_speeds = self.current_playback.get('speed_presets', [600, 800, 1000, 1200])
-
-            for i, (key_var, speed_var) in enumerate(zip(self.preset_key_vars, self.preset_speed_vars)):
-                if i >= 4:
-                    break
-                
-                key = key_var.get().strip()
-                speed_str = speed_var.get().strip()
-                
-                try:
-                    speed = int(speed_str)
-                    if speed not in available_speeds and available_speeds:
-                        speed = available_speeds[0]
-                except (ValueError, TypeError):
-                    speed = available_speeds[i] if i < len(available_speeds) else 600
-                    
-                new_preset_mappings.append({
-                    "key": key,
-                    "speed": speed
-                })
-
-            current_mappings = self.current_speed_change.get('preset_mappings', [])
-            speed_change_changed = new_preset_mappings != current_mappings
-
-            if speed_change_changed:
-                updates["speed_change_settings"] = {"preset_mappings": new_preset_mappings}
-
-            new_lang_code = self._get_selected_lang_code()
-            layout_name = self.keyboard_layout_var.get()
+            needs_restart = bool(changed.keys() & _RESTART_FIELDS)
             
-            if new_lang_code != original_lang or layout_name != original_layout:
-                if "ui_settings" not in updates:
-                    updates["ui_settings"] = {}
-                updates["ui_settings"]["selected_language"] = new_lang_code
-                updates["ui_settings"]["keyboard_layout"] = layout_name
+            if needs_restart:
+                updates["ui_settings"]["selected_language"] = new.language
+                updates["ui_settings"]["keyboard_layout"] = new.keyboard_layout
+
+            updates = dict(updates)
 
             if updates:
-                if ConfigManager.save(updates):
+                saved_config = ConfigManager.save(updates)
+                if saved_config:
+                    self.config = saved_config
+                    self.current = new
+                    self._key_durations_str = self.key_durations_var.get()
+                    self._speed_presets_str = self.speed_presets_var.get()
+                    self._orig_snapshot = raw_values
+                    
                     if "timing_settings" in updates and self.timing_callback:
-                        timing_updates = updates["timing_settings"]
-                        if "delays" not in timing_updates:
-                            timing_updates["delays"] = {
-                                "initial_delay": self.current_delays["initial_delay"],
-                                "pause_resume_delay": self.current_delays["pause_resume_delay"]
-                            }
-                        self.timing_callback(timing_updates)
+                        self._queue_callback(self.timing_callback, updates["timing_settings"])
                     
                     if "playback_settings" in updates and self.playback_callback:
-                        self.playback_callback(updates["playback_settings"])
+                        self._queue_callback(self.playback_callback, updates["playback_settings"])
                     
-                    if speed_change_changed and self.speed_change_callback:
-                        self.speed_change_callback({"preset_mappings": new_preset_mappings})
+                    if "speed_change_settings" in updates and self.speed_change_callback:
+                        self._queue_callback(self.speed_change_callback, updates["speed_change_settings"])
                     
-                    if new_pause_key != original_pause_key and self.pause_key_callback:
-                        self.pause_key_callback(new_pause_key)
+                    if "pause_key" in changed and self.pause_key_callback:
+                        self._queue_callback(self.pause_key_callback, new.pause_key)
                     
-                    if new_theme != original_theme and self.theme_callback:
-                        self.theme_callback(new_theme)
-                        ctk.set_appearance_mode(new_theme)
-
-                    needs_restart = (original_layout != layout_name) or (original_lang != new_lang_code)
+                    if "theme" in changed and self.theme_callback:
+                        self._queue_callback(self.theme_callback, new.theme)
+                        self._queue_callback(ctk.set_appearance_mode, new.theme)
                     
                     if needs_restart:
                         if messagebox.askyesno(
@@ -756,20 +865,49 @@ class SettingsWindow:
             logger.error(f"Error saving settings: {e}")
             messagebox.showerror(LanguageManager.get('error_title'), LanguageManager.get('settings_save_error'))
 
+    def _queue_callback(self, callback, payload):
+        """Queue a post-save callback; all queued callbacks run in one idle flush"""
+        if not self._pending_callbacks:
+            (self.parent or self.window).after_idle(self._flush_callbacks)
+        self._pending_callbacks[callback] = payload
+
+    def _flush_callbacks(self):
+        """Dispatch the callbacks queued by the last save"""
+        pending, self._pending_callbacks = self._pending_callbacks, {}
+        for callback, payload in pending.items():
+            try:
+                callback(payload)
+            except Exception as e:
+                logger.error(f"Settings callback failed: {e}")
+
     def _restart_main_application(self):
         try:
-            import subprocess
-            import sys
-            import os
-            import time
-            
             python = sys.executable
             script = os.path.abspath(sys.argv[0])
             
             self._on_close()
-            time.sleep(0.5)
             
-            subprocess.Popen([python, script])
+            if self.parent:
+                self.parent.after(0, lambda: self._spawn_new_instance(python, script))
+            else:
+                self._spawn_new_instance(python, script)
+            
+        except Exception as e:
+            logger.error(f"Failed to restart main application: {e}")
+            messagebox.showerror(LanguageManager.get('error_title'), LanguageManager.get('settings_restart_failed'))
+
+    def _spawn_new_instance(self, python, script):
+        """Start a detached copy of the application and close this one"""
+        try:
+            creationflags = 0
+            if os.name == 'nt':
+                creationflags = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+            subprocess.Popen(
+                [python, script],
+                close_fds=True,
+                start_new_session=True,
+                creationflags=creationflags
+            )
 
             if self.parent:
                 self.parent.destroy()
@@ -780,19 +918,12 @@ class SettingsWindow:
 
     def _parse_array_setting(self, value_str, converter):
         try:
-            if not value_str.strip():
-                return []
-            values = [converter(x.strip()) for x in value_str.split(",") if x.strip()]
-            return values
+            return [converter(x) for x in value_str.split(",") if x and not x.isspace()]
         except ValueError:
             raise ValueError(f"Invalid array format: {value_str}")
 
     def _get_selected_lang_code(self):
-        lang_name = self.language_var.get()
-        for code, name, _ in LanguageManager.get_languages():
-            if name == lang_name:
-                return code
-        return "en_US"
+        return LanguageManager.get_code_for(self.language_var.get(), "en_US")
 
     def _reset_defaults(self):
         if messagebox.askyesno(LanguageManager.get('warning_title'), LanguageManager.get('settings_reset_confirm')):
@@ -808,12 +939,12 @@ class SettingsWindow:
         except:
             pass
 
-        if self in SettingsWindow._open_windows:
-            SettingsWindow._open_windows.remove(self)
+        if SettingsWindow._current is self:
+            SettingsWindow._current = None
 
         if self.window.winfo_exists():
             self.window.destroy()
 
     @classmethod
     def is_open(cls):
-        return len(cls._open_windows) > 0
\ No newline at end of file
+        return cls._current is not None
\ No newline at end of file
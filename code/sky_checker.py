@@ -1,7 +1,7 @@
 # Copyright (C) 2025 VanilleIce
 # This program is licensed under the GNU AGPLv3. See LICENSE for details.
 
-import logging, sys, os
+import logging, sys, os, re, stat
 import customtkinter as ctk
 from tkinter import messagebox, filedialog
 from pathlib import Path
@@ -11,12 +11,21 @@ from resource_loader import resource_path
 
 logger = logging.getLogger("ProjectLyrica.skychecker")
 
+_SKY_EXE_RE = re.compile(r'[/\\]sky\.exe$', re.IGNORECASE)
+
+def _is_file(path):
+    """Check that path is an existing regular file"""
+    try:
+        return stat.S_ISREG(os.stat(path).st_mode)
+    except OSError:
+        return False
+
 class SkyChecker:
     @staticmethod
     def show_initial_settings():
         # Check if path already exists and is valid
         current_path = ConfigManager.get_value("game_settings.sky_exe_path", "")
-        if current_path and os.path.exists(current_path) and current_path.endswith("Sky.exe"):
+        if current_path and _SKY_EXE_RE.search(current_path) and _is_file(current_path):
             return
 
         root = ctk.CTk()
@@ -27,18 +36,7 @@ class SkyChecker:
         saved = False
         example_path = "C:\\Program Files (x86)\\Steam\\steamapps\\common\\Sky Children of the Light\\Sky.exe"
         
-        def on_close():
-            nonlocal saved
-            current_value = path_var.get().strip()
-            if not saved and current_value and current_value != example_path:
-                messagebox.showerror(
-                    LanguageManager.get('error_title'),
-                    LanguageManager.get('exe_path_required_exit')
-                )
-                sys.exit(1)
-            root.destroy()
-        
-        root.protocol("WM_DELETE_WINDOW", on_close)
+        root.protocol("WM_DELETE_WINDOW", root.destroy)
         
         ctk.CTkLabel(root, 
                     text=LanguageManager.get('select_sky_exe_instruction'),
@@ -74,30 +72,23 @@ class SkyChecker:
         browse_btn = ctk.CTkButton(frame, text="...", width=30, command=browse_file)
         browse_btn.pack(side="left")
         
+        validators = (
+            (lambda p: p and p != example_path, 'exe_path_required'),
+            (_SKY_EXE_RE.search, 'must_select_sky'),
+            (_is_file, 'exe_path_invalid'),
+        )
+        
         def save_and_continue():
             nonlocal saved
             exe_path = path_var.get().strip()
             
-            if not exe_path or exe_path == example_path:
-                messagebox.showwarning(
-                    LanguageManager.get('warning_title'),
-                    LanguageManager.get('exe_path_required')
-                )
-                return
-            
-            if not exe_path.lower().endswith("sky.exe"):
-                messagebox.showwarning(
-                    LanguageManager.get('warning_title'),
-                    LanguageManager.get('must_select_sky')
-                )
-                return
-            
-            if not os.path.exists(exe_path):
-                messagebox.showwarning(
-                    LanguageManager.get('warning_title'),
-                    LanguageManager.get('exe_path_invalid')
-                )
-                return
+            for check, msg_key in validators:
+                if not check(exe_path):
+                    messagebox.showwarning(
+                        LanguageManager.get('warning_title'),
+                        LanguageManager.get(msg_key)
+                    )
+                    return
             
             ConfigManager.save({
                 "game_settings": {
@@ -118,9 +109,8 @@ class SkyChecker:
         root.grab_set()
         root.mainloop()
         
-        # Final validation after window closes
-        final_path = path_var.get().strip()
-        if not saved and (not final_path or final_path == example_path):
+        # Closing the window without saving a valid path exits the application
+        if not saved:
             messagebox.showerror(
                 LanguageManager.get('error_title'),
                 LanguageManager.get('exe_path_required_exit')
@@ -1,24 +1,116 @@
 # Copyright (C) 2025 VanilleIce
 # This program is licensed under the GNU AGPLv3. See LICENSE for details.
 
-import requests, re, socket, logging
+import requests, json, time, logging
+from concurrent.futures import Future
+from functools import lru_cache
+from threading import Thread
+from pathlib import Path
 from typing import Tuple
 from urllib.parse import urljoin
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger("ProjectLyrica.UpdateChecker")
 
+_ERROR = ("error", "", "")
+_NO_CONNECTION = ("no_connection", "", "")
+
+_SESSION = requests.Session()
+_SESSION.headers.update({
+    "User-Agent": "ProjectLyrica",
+    "Accept": "application/vnd.github.v3+json",
+    "Accept-Encoding": "gzip, deflate"
+})
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=2,
+    max_retries=Retry(total=2, connect=0, read=0, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+))
+
+TTL_HOURS = 4
+CACHE_FILE = Path('update_check.json')
+
+class _VersionChars(dict):
+    """str.translate table that keeps digits and dots and drops everything else."""
+    def __missing__(self, key):
+        return None
+
+_VERSION_TABLE = _VersionChars((ord(c), c) for c in "0123456789.")
+
+@lru_cache(maxsize=256)
 def version_tuple(v: str) -> Tuple[int, int, int]:
     """Convert version string to comparable tuple."""
     try:
-        clean = re.sub(r'[^0-9.]', '', v)
-        parts = clean.split('.')
-        while len(parts) < 3:
-            parts.append('0')
+        parts = v.translate(_VERSION_TABLE).split('.')
+        parts += ['0'] * (3 - len(parts))
         return tuple(map(int, parts))
-    except (ValueError, TypeError) as e:
+    except (ValueError, TypeError, AttributeError) as e:
         logger.error(f"Version parsing failed for '{v}': {e}")
         return (0, 0, 0)
 
+_CACHE_TYPES = {
+    "tag_name": str,
+    "html_url": str,
+    "fetched_at": (int, float),
+    "etag": str,
+    "last_modified": str,
+    "blocked_until": (int, float)
+}
+
+def _load_cache() -> dict:
+    """Return the last stored release lookup, keeping only well-typed entries."""
+    try:
+        with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    
+    if not isinstance(data, dict):
+        return {}
+    return {key: value for key, value in data.items() if isinstance(value, _CACHE_TYPES.get(key, ()))}
+
+def _save_cache(data: dict) -> None:
+    try:
+        with open(CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+    except OSError as e:
+        logger.warning(f"Could not write update cache: {e}")
+
+def _compare(current_version: str, latest: str, url: str) -> Tuple[str, str, str]:
+    """Build the check_update result for a known latest release."""
+    logger.info(f"Version check: Local={current_version}, GitHub={latest}")
+    
+    # Identical tags need no parsing; latest already has its "v" prefix stripped
+    if latest == current_version:
+        logger.info(f"Using latest version: {current_version}")
+        return ("current", latest, url)
+    
+    current_ver = version_tuple(current_version)
+    latest_ver = version_tuple(latest)
+    
+    if latest_ver > current_ver:
+        logger.info(f"Update available: {current_version} → {latest}")
+        return ("update", latest, url)
+    elif latest_ver == current_ver:
+        logger.info(f"Using latest version: {current_version}")
+        return ("current", latest, url)
+    else:
+        logger.info(f"Local version is newer: {current_version} (GitHub has {latest})")
+        return ("current", latest, url)
+
+def _rate_limit_reset(response) -> float:
+    """Return when a rate-limited request may be retried, or 0 if it was not rate limited."""
+    headers = response.headers
+    try:
+        if 'Retry-After' in headers:
+            return time.time() + int(headers['Retry-After'])
+        if headers.get('X-RateLimit-Remaining') == '0':
+            return float(headers.get('X-RateLimit-Reset', time.time() + 3600))
+    except ValueError:
+        return time.time() + 3600
+    return 0
+
 def check_update(current_version: str, repo: str) -> Tuple[str, str, str]:
     """
     Check for updates on GitHub.
@@ -27,16 +119,18 @@ def check_update(current_version: str, repo: str) -> Tuple[str, str, str]:
         Tuple: (status, latest_version, url)
         status: "update", "current", "no_connection", or "error"
     """
-    # Connection check
-    try:
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            s.settimeout(2)
-            if s.connect_ex(("api.github.com", 443)) != 0:
-                logger.warning("No internet connection for update check")
-                return ("no_connection", "", "")
-    except socket.error as e:
-        logger.warning(f"Socket error during connection check: {e}")
-        return ("no_connection", "", "")
+    # A recent lookup is reused unless the installed version has moved past it
+    cache = _load_cache()
+    cached_latest = cache.get("tag_name", "")
+    if (cached_latest
+            and time.time() - cache.get("fetched_at", 0) < TTL_HOURS * 3600
+            and version_tuple(current_version) <= version_tuple(cached_latest)):
+        logger.info("Using cached update check result")
+        return _compare(current_version, cached_latest, cache.get("html_url", ""))
+    
+    if cache.get("blocked_until", 0) > time.time():
+        logger.info("Skipping update check until the GitHub rate limit resets")
+        return _ERROR
     
     # GitHub API request
     try:
@@ -46,21 +140,29 @@ def check_update(current_version: str, repo: str) -> Tuple[str, str, str]:
         endpoint = f"repos/{repo}/releases/latest"
         api_url = urljoin(base_url, endpoint)
         
-        response = requests.get(
-            api_url,
-            timeout=5,
-            headers={
-                "User-Agent": "ProjectLyrica",
-                "Accept": "application/vnd.github.v3+json"
-            }
-        )
+        headers = {}
+        if cached_latest:
+            if cache.get("etag"):
+                headers["If-None-Match"] = cache["etag"]
+            if cache.get("last_modified"):
+                headers["If-Modified-Since"] = cache["last_modified"]
+        
+        response = _SESSION.get(api_url, timeout=(2, 5), headers=headers)
+        
+        # Release unchanged since the cached lookup
+        if response.status_code == 304:
+            cache["fetched_at"] = time.time()
+            _save_cache(cache)
+            return _compare(current_version, cached_latest, cache.get("html_url", ""))
         
         # Rate limit check
-        if response.status_code == 403 and 'X-RateLimit-Remaining' in response.headers:
-            remaining = int(response.headers['X-RateLimit-Remaining'])
-            if remaining == 0:
+        if response.status_code in (403, 429):
+            blocked_until = _rate_limit_reset(response)
+            if blocked_until:
                 logger.warning("GitHub API rate limit exceeded")
-                return ("error", "", "")
+                cache["blocked_until"] = blocked_until
+                _save_cache(cache)
+                return _ERROR
         
         response.raise_for_status()
         data = response.json()
@@ -70,35 +172,53 @@ def check_update(current_version: str, repo: str) -> Tuple[str, str, str]:
         
         if not latest:
             logger.error("GitHub API response did not contain a version tag")
-            return ("error", "", "")
-        
-        logger.info(f"Version check: Local={current_version}, GitHub={latest}")
-        
-        current_ver = version_tuple(current_version)
-        latest_ver = version_tuple(latest)
+            return _ERROR
         
-        if latest_ver > current_ver:
-            logger.info(f"Update available: {current_version} → {latest}")
-            return ("update", latest, url)
-        elif latest_ver == current_ver:
-            logger.info(f"Using latest version: {current_version}")
-            return ("current", latest, url)
-        else:
-            logger.info(f"Local version is newer: {current_version} (GitHub has {latest})")
-            return ("current", latest, url)
+        _save_cache({
+            "tag_name": latest,
+            "html_url": url,
+            "fetched_at": time.time(),
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified")
+        })
+        return _compare(current_version, latest, url)
             
+    except (requests.exceptions.SSLError, requests.exceptions.ProxyError) as e:
+        logger.error(f"GitHub API request failed: {str(e)}")
+        return _ERROR
+    except requests.exceptions.ConnectionError as e:
+        logger.warning(f"No internet connection for update check: {e}")
+        return _NO_CONNECTION
     except requests.exceptions.Timeout:
         logger.warning("GitHub API request timed out")
-        return ("error", "", "")
+        return _ERROR
     except requests.exceptions.HTTPError as e:
         logger.error(f"GitHub API request failed with HTTP error: {e.response.status_code if hasattr(e, 'response') else 'Unknown'}")
-        return ("error", "", "")
+        return _ERROR
     except requests.exceptions.RequestException as e:
         logger.error(f"GitHub API request failed: {str(e)}")
-        return ("error", "", "")
+        return _ERROR
     except Exception as e:
         logger.error(f"Unexpected error during update check: {str(e)}")
-        return ("error", "", "")
+        return _ERROR
+
+def check_update_background(current_version: str, repo: str) -> Future:
+    """
+    Run check_update on a daemon thread; the Future resolves to its result tuple.
+    
+    A daemon thread never holds up interpreter exit, so closing or restarting
+    the app while a request is in flight does not wait for its timeouts.
+    """
+    future = Future()
+    
+    def run():
+        try:
+            future.set_result(check_update(current_version, repo))
+        except Exception as e:
+            future.set_exception(e)
+    
+    Thread(target=run, name="UpdateChecker", daemon=True).start()
+    return future
 
 def check_for_updates(current_version: str, repo: str) -> Tuple[str, str, str]:
     """Wrapper function for backward compatibility"""